@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Sequence, Union
 import meerkat as mk
 import numpy as np
 from scipy.stats import mode
@@ -14,7 +14,7 @@ def describe(
     text: mk.DataPanel = None,
     text_embeddings: Union[str, np.ndarray] = "embedding",
     phrases: Union[str, np.ndarray] = "output_phrase",
-    slice_idx: int = 0,
+    slice_idx: Union[int, Sequence[int]] = 0,
     slice_threshold: float = 0.5,
 ) -> mk.DataPanel:
     """Generate descriptions of a discovered slice. 
@@ -48,7 +48,11 @@ def describe(
         phrase (Union[str, np.ndarray], optional): The name of a column in ``text``
             holding text phrases. If ``text`` is ``None``, then an np.ndarray of
             shape (n_phrases,). Defaults to "output_phrase".
-        slice_idx (int, optional): The index of the slice to describe. Defaults to 0.
+        slice_idx (Union[int, Sequence[int]], optional): The index of the slice to
+            describe. Pass a sequence of indices to describe several slices at once,
+            in which case the per-class reference embeddings are computed only once
+            and the "score" column has shape (n_phrases, len(slice_idx)). Defaults
+            to 0.
         slice_threshold (float, optional): The probability threshold for inclusion in 
             the slice. Defaults to 0.5.
 
@@ -95,10 +99,21 @@ def describe(
     embeddings, targets, slices = unpack_args(data, embeddings, targets, slices)
     text_embeddings, phrases = unpack_args(text, text_embeddings, phrases)
 
-    slice_mask = slices[:, slice_idx] > slice_threshold
-    slice_proto = embeddings[slice_mask].mean(axis=0)
-    mode_target = mode(targets[slice_mask]).mode[0]
-    ref_proto = embeddings[targets == mode_target].mean(axis=0)
+    slice_idxs = np.atleast_1d(slice_idx)
 
-    scores = np.dot(text_embeddings, (slice_proto - ref_proto))
+    # the reference prototype of each class is computed at most once, even if it is
+    # shared by several of the slices being described
+    class_protos = {}
+    diffs = []
+    for idx in slice_idxs:
+        slice_mask = slices[:, idx] > slice_threshold
+        slice_proto = embeddings[slice_mask].mean(axis=0)
+        mode_target = np.ravel(mode(targets[slice_mask]).mode)[0]
+        if mode_target not in class_protos:
+            class_protos[mode_target] = embeddings[targets == mode_target].mean(axis=0)
+        diffs.append(slice_proto - class_protos[mode_target])
+
+    scores = np.dot(text_embeddings, np.stack(diffs, axis=1))
+    if np.ndim(slice_idx) == 0:
+        scores = scores[:, 0]
     return mk.DataPanel({"score": scores, "phrase": phrases})
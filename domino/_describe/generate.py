@@ -1,5 +1,6 @@
 import torch
 import meerkat as mk
+from functools import lru_cache
 from itertools import product
 import numpy as np
 from typing import List
@@ -42,18 +43,26 @@ def generate_candidate_descriptions(
         output_probs = []
         for sent_idx in range(probs.shape[0]):
             mask_mask = input_ids[sent_idx] == PAD_TOKEN_ID
-            mask_range = torch.arange(mask_mask.sum())
+            n_masks = int(mask_mask.sum())
+            mask_range = torch.arange(n_masks, device=device)
             token_ids = top_k_out.indices[sent_idx, mask_mask]
             token_probs = top_k_out.values[sent_idx, mask_mask]
-            for local_idxs in product(np.arange(k), repeat=mask_mask.sum()):
-                output_ids = torch.clone(input_ids[sent_idx])
-                output_ids[mask_mask] = token_ids[mask_range, local_idxs]
-                output_phrases.append(
-                    tokenizer.decode(output_ids, skip_special_tokens=True)
-                )
-                output_probs.append(
-                    token_probs[mask_range, local_idxs].mean().cpu().numpy()
-                )
+
+            # every combination of the top-k tokens at each mask, shape (k^n_masks,
+            # n_masks), so all candidates for the sentence are filled in at once
+            local_idxs = torch.tensor(
+                list(product(range(k), repeat=n_masks)), dtype=torch.long, device=device
+            ).reshape(k ** n_masks, n_masks)
+
+            output_ids = input_ids[sent_idx].repeat(len(local_idxs), 1)
+            output_ids[:, mask_mask] = token_ids[mask_range, local_idxs]
+            output_phrases.extend(
+                tokenizer.batch_decode(output_ids, skip_special_tokens=True)
+            )
+            output_probs.append(token_probs[mask_range, local_idxs].mean(dim=-1))
+
+        # a single device-to-host copy per batch rather than one per phrase
+        output_probs = torch.cat(output_probs).cpu().numpy()
 
         return {"prob": output_probs, "output_phrase": output_phrases}
 
@@ -92,7 +101,10 @@ def generate_candidate_descriptions(
     return mk.DataPanel.from_pandas(candidate_phrases)
 
 
-def _get_wiki_words(top_k: int = 1e5, eng_only: bool = False):
+@lru_cache(maxsize=4)
+def _read_wiki_words(top_k: int, eng_only: bool) -> pd.DataFrame:
+    # only the (small) top-k result is cached, so the full frequency list is freed
+    # once it has been filtered
     df = pd.read_csv(
         "https://github.com/IlyaSemenov/wikipedia-word-frequency/raw/master/results/enwiki-20190320-words-frequency.txt",
         delimiter=" ",
@@ -103,7 +115,10 @@ def _get_wiki_words(top_k: int = 1e5, eng_only: bool = False):
         import nltk
         from nltk.corpus import words
 
-        nltk.download("words")
+        try:
+            nltk.data.find("corpora/words")
+        except LookupError:
+            nltk.download("words")
 
         eng_words = words.words()
         eng_df = pd.DataFrame({"word": eng_words})
@@ -111,4 +126,11 @@ def _get_wiki_words(top_k: int = 1e5, eng_only: bool = False):
 
     df = df.sort_values("frequency", ascending=False)
     df = df.drop_duplicates(subset=["word"])
-    return mk.DataPanel.from_pandas(df.iloc[: int(top_k)])
+    return df.iloc[:top_k].copy()
+
+
+def _get_wiki_words(top_k: int = 1e5, eng_only: bool = False):
+    # the cached frame is shared between calls, so each caller gets a copy
+    return mk.DataPanel.from_pandas(
+        _read_wiki_words(top_k=int(top_k), eng_only=eng_only).copy()
+    )
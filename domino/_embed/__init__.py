@@ -1,14 +1,20 @@
 import os
-from typing import Callable, Union
+from contextlib import nullcontext
+from functools import partial
+from typing import Callable, Dict, List, Sequence, Tuple, Union
 
 import meerkat as mk
 import torch
+from torch.utils.data import DataLoader
+from torch.utils.data.dataloader import default_collate
+from tqdm.auto import tqdm
 
 from domino._embed.encoder import Encoder
 
 from ..registry import Registry
 from .bit import bit
 from .clip import clip
+from .utils import EmbeddingWriter, PrefetchLoader
 
 __all__ = ["clip", "bit"]
 
@@ -31,13 +37,14 @@ def infer_modality(col: mk.AbstractColumn):
 def embed(
     data: mk.DataPanel,
     input_col: str,
-    encoder: Union[str, Encoder] = "clip",
+    encoder: Union[str, Encoder, Sequence[str]] = "clip",
     modality: str = None,
-    out_col: str = None,
+    out_col: Union[str, Sequence[str]] = None,
     device: Union[int, str] = "cpu",
     mmap_dir: str = None,
     num_workers: int = 4,
     batch_size: int = 128,
+    autocast: bool = False,
     **kwargs,
 ) -> mk.DataPanel:
     """Embed a column of data with an encoder from the encoder registry.
@@ -61,19 +68,33 @@ def embed(
             encoder="clip"
         )
 
+    To embed the same images with several encoders, pass a list of encoder names.
+    Each image is then loaded from disk only once and fed to every encoder:
+
+    .. code-block:: python
+
+        dp = embed(
+            data=dp,
+            input_col="img",
+            encoder=["clip", "bit"]
+        )
+
 
     Args:
         data (mk.DataPanel): A DataPanel containing the data to embed.
         input_col (str): The name of the column to embed.
-        encoder (Union[str, Encoder], optional): Name of the encoder to use. List
-            supported encoders with ``domino.encoders``. Defaults to "clip".
+        encoder (Union[str, Encoder, Sequence[str]], optional): Name of the encoder to
+            use. List supported encoders with ``domino.encoders``. Defaults to "clip".
             Alternatively, pass an :class:`~domino._embed.encoder.Encoder` object
-            containing a custom encoder.
+            containing a custom encoder. If a list of encoder names is passed, the data
+            is loaded once and embedded with each of the encoders.
         modality (str, optional): The modality of the data to be embedded. Defaults to
             None, in which case the modality is inferred from the type of the input
             column.
-        out_col (str, optional): The name of the column where the embeddings are stored.
-            Defaults to None, in which case it is ``"{encoder}({input_col})"``.
+        out_col (Union[str, Sequence[str]], optional): The name of the column where the
+            embeddings are stored. Defaults to None, in which case it is
+            ``"{encoder}({input_col})"``. If ``encoder`` is a list, ``out_col`` must be
+            None or a list of the same length.
         device (Union[int, str], optional): The device on which. Defaults to "cpu".
         mmap_dir (str, optional): The path to directory where a memory-mapped file
             containing the embeddings will be written. Defaults to None, in which case
@@ -81,9 +102,13 @@ def embed(
         num_workers (int, optional): Number of worker processes used to load the data
             from disk. Defaults to 4.
         batch_size (int, optional): Size of the batches to  used . Defaults to 128.
+        autocast (bool, optional): If True, the forward pass is run in bfloat16 mixed
+            precision and the embeddings are stored as float16, halving their size.
+            Defaults to False.
         **kwargs: Additional keyword arguments are passed to the encoder. To see
             supported arguments for each encoder, see the encoder documentation (e.g.
-            :func:`~domino._embed.clip`).
+            :func:`~domino._embed.clip`). If ``encoder`` is a list, the keyword
+            arguments are passed to every encoder.
 
     Returns:
         mk.DataPanel: A view of ``data`` with a new column containing the embeddings.
@@ -94,64 +119,148 @@ def embed(
 
         modality = infer_modality(col=data[input_col])
 
+    encoder_names = list(encoder) if isinstance(encoder, (list, tuple)) else [encoder]
+
     if out_col is None:
-        out_col = f"{encoder}({input_col})"
+        out_cols = [f"{name}({input_col})" for name in encoder_names]
+    elif isinstance(out_col, str):
+        out_cols = [out_col]
+    else:
+        out_cols = list(out_col)
+
+    if len(out_cols) != len(encoder_names):
+        raise ValueError(
+            f"Got {len(out_cols)} output columns for {len(encoder_names)} encoders."
+        )
 
-    encoder = encoders.get(encoder, device=device, **kwargs)
+    col_to_encoder = {}
+    for name, col in zip(encoder_names, out_cols):
+        modality_encoders = encoders.get(name, device=device, **kwargs)
 
-    if modality not in encoder:
-        raise ValueError(f'Encoder "{encoder}" does not support modality "{modality}".')
+        if modality not in modality_encoders:
+            raise ValueError(
+                f'Encoder "{name}" does not support modality "{modality}".'
+            )
 
-    encoder = encoder[modality]
+        col_to_encoder[col] = modality_encoders[modality]
 
     return _embed(
         data=data,
         input_col=input_col,
-        out_col=out_col,
-        encode=encoder.encode,
-        preprocess=encoder.preprocess,
-        collate=encoder.collate,
+        col_to_encoder=col_to_encoder,
         device=device,
         mmap_dir=mmap_dir,
         num_workers=num_workers,
         batch_size=batch_size,
+        autocast=autocast,
     )
 
 
 def _embed(
     data: mk.DataPanel,
     input_col: str,
-    out_col: str,
-    encode: Callable,
-    preprocess: Callable,
-    collate: Callable,
+    col_to_encoder: Dict[str, Encoder],
     device: int = None,
     mmap_dir: str = None,
     num_workers: int = 4,
     batch_size: int = 128,
+    autocast: bool = False,
 ):
     if device is None:
         device = "cuda" if torch.cuda.is_available() else "cpu"
 
-    if preprocess is not None:
-        embed_input = data[input_col].to_lambda(preprocess)
-    else:
-        embed_input = data[input_col]
+    # each example is loaded once and preprocessed for every encoder in the loader
+    # workers, so embedding with several encoders only requires a single pass over
+    # the data on disk
+    pin_memory = torch.device(device).type == "cuda"
+    dl = DataLoader(
+        data[input_col],
+        batch_size=batch_size,
+        num_workers=num_workers,
+        collate_fn=partial(
+            _collate,
+            transforms={
+                col: (encoder.preprocess, encoder.collate)
+                for col, encoder in col_to_encoder.items()
+            },
+        ),
+        pin_memory=pin_memory,
+    )
 
-    if collate is not None:
-        embed_input.collate_fn = collate
-    
-    with torch.no_grad():
-        data[out_col] = embed_input.map(
-            lambda x: encode(x.data.to(device)).cpu().detach().numpy(),
-            pbar=True,
-            is_batched_fn=True,
-            batch_size=batch_size,
-            num_workers=num_workers,
-            mmap=mmap_dir is not None,
-            mmap_path=None
+    writers = {
+        col: EmbeddingWriter(
+            length=len(data),
+            path=None
             if mmap_dir is None
-            else os.path.join(mmap_dir, "emb_mmap.npy"),
+            else _get_mmap_path(mmap_dir, col, multiple=len(col_to_encoder) > 1),
             flush_size=128,
         )
+        for col in col_to_encoder
+    }
+
+    # when embedding with several encoders on a GPU, each encoder runs on its own
+    # stream so that their kernels can overlap
+    streams = (
+        {col: torch.cuda.Stream(device=device) for col in col_to_encoder}
+        if torch.device(device).type == "cuda" and len(col_to_encoder) > 1
+        else None
+    )
+
+    with torch.no_grad():
+        for batch in tqdm(PrefetchLoader(dl, device=device)):
+            with (
+                torch.autocast(
+                    device_type=torch.device(device).type, dtype=torch.bfloat16
+                )
+                if autocast
+                else nullcontext()
+            ):
+                embs = _encode(batch, col_to_encoder=col_to_encoder, streams=streams)
+            for col, emb in embs.items():
+                if autocast:
+                    # numpy has no bfloat16, so store the embeddings in float16
+                    emb = emb.to(torch.float16)
+                writers[col].write(emb.cpu().detach().numpy())
+
+    for col, writer in writers.items():
+        data[col] = writer.finalize()
     return data
+
+
+def _encode(
+    batch: Dict[str, torch.Tensor],
+    col_to_encoder: Dict[str, Encoder],
+    streams: Dict[str, torch.cuda.Stream] = None,
+) -> Dict[str, torch.Tensor]:
+    if streams is None:
+        return {
+            col: encoder.encode(batch[col]) for col, encoder in col_to_encoder.items()
+        }
+
+    current_stream = torch.cuda.current_stream(next(iter(streams.values())).device)
+    embs = {}
+    for col, encoder in col_to_encoder.items():
+        stream = streams[col]
+        stream.wait_stream(current_stream)
+        if torch.is_tensor(batch[col]):
+            batch[col].record_stream(stream)
+        with torch.cuda.stream(stream):
+            embs[col] = encoder.encode(batch[col])
+
+    for stream in streams.values():
+        current_stream.wait_stream(stream)
+    return embs
+
+
+def _collate(batch: List, transforms: Dict[str, Tuple[Callable, Callable]]):
+    out = {}
+    for col, (preprocess, collate) in transforms.items():
+        inputs = batch if preprocess is None else [preprocess(x) for x in batch]
+        out[col] = (default_collate if collate is None else collate)(inputs)
+    return out
+
+
+def _get_mmap_path(mmap_dir: str, out_col: str, multiple: bool = False):
+    if multiple:
+        return os.path.join(mmap_dir, out_col, "emb_mmap.npy")
+    return os.path.join(mmap_dir, "emb_mmap.npy")
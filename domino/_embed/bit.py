@@ -11,7 +11,12 @@ import torch.nn.functional as F
 
 from ..utils import nested_getattr
 from .encoder import Encoder
-from .utils import ActivationExtractor, _get_reduction_fn
+from .utils import (
+    ActivationExtractor,
+    StopForward,
+    _get_reduction_fn,
+    maybe_compile,
+)
 
 # this implementation is primarily an adaptation of this colab
 # https://colab.research.google.com/github/google-research/big_transfer/blob/master/colabs/big_transfer_pytorch.ipynb
@@ -22,6 +27,7 @@ def bit(
     device: Union[int, str] = "cpu",
     reduction: str = "mean",
     layer: str = "body",
+    compile_model: bool = False,
 ) -> Dict[str, Encoder]:
     """Big Transfer (BiT) encoders [kolesnivok_2019]_. Includes encoders for the
     following modalities:
@@ -37,6 +43,9 @@ def bit(
             dimensions). Defaults to "mean". Other options include "max".
         layer (str, optional): The layer of the model from which the embeddings will
             beto extract the embeddings from. Defaults to "body".
+        compile_model (bool, optional): Whether to compile the model with
+            ``torch.compile`` (requires torch>=2.0). The first batch pays the
+            compilation cost. Defaults to False.
 
     .. [kolesnivok_2019]
 
@@ -56,17 +65,25 @@ def bit(
 
     layer = nested_getattr(model, layer)
 
-    extractor = ActivationExtractor(reduction_fn=_get_reduction_fn(reduction))
+    # only the activations of `layer` are used, so the forward pass is stopped there
+    # rather than running the remaining layers and the classification head
+    extractor = ActivationExtractor(
+        reduction_fn=_get_reduction_fn(reduction), stop_forward=True
+    )
     layer.register_forward_hook(extractor.add_hook)
 
     model.to(device)
+    forward = maybe_compile(model, compile_model=compile_model)
 
     @torch.no_grad()
     def _embed(batch: torch.tensor):
-        model(batch)  # run forward pass, but don't collect output
+        try:
+            forward(batch)  # run forward pass, but don't collect output
+        except StopForward:
+            pass
         return extractor.activation
 
-    return {"image": Encoder(encoder=_embed, preprocess=transform)}
+    return {"image": Encoder(encode=_embed, preprocess=transform)}
 
 
 def transform(img: PIL.Image.Image):
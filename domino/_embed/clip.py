@@ -1,10 +1,13 @@
 from typing import Dict, Union
 
 from .encoder import Encoder
+from .utils import maybe_compile
 
 
 def clip(
-    variant: str = "ViT-B/32", device: Union[int, str] = "cpu"
+    variant: str = "ViT-B/32",
+    device: Union[int, str] = "cpu",
+    compile_model: bool = False,
 ) -> Dict[str, Encoder]:
     """Contrastive Language-Image Pre-training (CLIP) encoders [radford_2021]_. Includes
     encoders for the following modalities:
@@ -20,7 +23,9 @@ def clip(
             "ViT-B/32".
         device (Union[int, str], optional): The device on which the encoders will be
             loaded. Defaults to "cpu".
-
+        compile_model (bool, optional): Whether to compile the encoders with
+            ``torch.compile`` (requires torch>=2.0). The first batch pays the
+            compilation cost. Defaults to False.
 
     .. [radford_2021]
 
@@ -38,9 +43,13 @@ def clip(
 
     model, preprocess = load(variant, device=device)
     return {
-        "image": Encoder(encode=model.encode_image, preprocess=preprocess),
+        "image": Encoder(
+            encode=maybe_compile(model.encode_image, compile_model=compile_model),
+            preprocess=preprocess,
+        ),
         "text": Encoder(
-            # need to squeeze out the batch dimension for compatibility with collate
-            encode=model.encode_text, preprocess=lambda x: tokenize(x, truncate=True).squeeze(0)
+            encode=maybe_compile(model.encode_text, compile_model=compile_model),
+            # tokenize each batch of strings with a single call in the loader workers
+            collate=lambda batch: tokenize(batch, truncate=True),
         ),
     }
@@ -1,27 +1,165 @@
+import os
+import warnings
 from functools import partial
+from typing import Any, Callable, Dict, Iterable, Union
 
+import numpy as np
 import torch
+from numpy.lib.format import open_memmap
+
+
+_REDUCTIONS = {
+    "mean": partial(torch.mean, dim=[-1, -2]),
+    "max": partial(torch.amax, dim=[-1, -2]),
+}
+for _name, _fn in _REDUCTIONS.items():
+    _fn.__name__ = _name
 
 
 def _get_reduction_fn(reduction_name):
-    if reduction_name == "max":
-        reduction_fn = partial(torch.mean, dim=[-1, -2])
-    elif reduction_name == "mean":
-        reduction_fn = partial(torch.mean, dim=[-1, -2])
-    else:
+    if reduction_name not in _REDUCTIONS:
         raise ValueError(f"reduction_fn {reduction_name} not supported.")
-    reduction_fn.__name__ = reduction_name
-    return reduction_fn
+    return _REDUCTIONS[reduction_name]
+
+
+def maybe_compile(fn: Callable, compile_model: bool = False) -> Callable:
+    """Compile ``fn`` with ``torch.compile`` if requested and supported by the
+    installed version of torch."""
+    if not compile_model:
+        return fn
+    if not hasattr(torch, "compile"):
+        warnings.warn(
+            "`compile_model=True` requires torch>=2.0, running the encoder in eager "
+            "mode instead."
+        )
+        return fn
+    return torch.compile(fn)
+
+
+class StopForward(Exception):
+    """Raised by an :class:`ActivationExtractor` to end a forward pass early."""
 
 
 class ActivationExtractor:
-    """Class for extracting activations a targetted intermediate layer"""
+    """Class for extracting activations a targetted intermediate layer. If
+    ``stop_forward`` is True, the hook raises :class:`StopForward` once the
+    activation is collected, so the layers after the targetted one are skipped."""
 
-    def __init__(self, reduction_fn: callable = None):
+    def __init__(self, reduction_fn: callable = None, stop_forward: bool = False):
         self.activation = None
         self.reduction_fn = reduction_fn
+        self.stop_forward = stop_forward
 
     def add_hook(self, module, input, output):
         if self.reduction_fn is not None:
             output = self.reduction_fn(output)
         self.activation = output
+        if self.stop_forward:
+            raise StopForward
+
+
+class EmbeddingWriter:
+    """Class for writing batches of embeddings into a preallocated array, optionally
+    a memory-mapped file, so that the embeddings are never held twice in memory."""
+
+    def __init__(self, length: int, path: str = None, flush_size: int = None):
+        self.length = length
+        self.path = path
+        self.flush_size = flush_size
+
+        self._file = None
+        self._pointer = 0
+        self._num_writes = 0
+
+    def _allocate(self, emb: np.ndarray) -> np.ndarray:
+        # the output is allocated on the first write, once the embedding dimension
+        # and dtype are known
+        shape = (self.length, *emb.shape[1:])
+        if self.path is None:
+            return np.empty(shape, dtype=emb.dtype)
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        return open_memmap(self.path, mode="w+", dtype=emb.dtype, shape=shape)
+
+    def write(self, emb: np.ndarray):
+        if self._file is None:
+            self._file = self._allocate(emb)
+
+        self._file[self._pointer : self._pointer + len(emb)] = emb
+        self._pointer += len(emb)
+        self._num_writes += 1
+        if (
+            self.path is not None
+            and self.flush_size is not None
+            and self._num_writes % self.flush_size == 0
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write the embeddings to disk and remap the file, so that the pages already
+        written can be released rather than accumulating in memory."""
+        self._file.flush()
+        self._file = None  # drop the only reference, which unmaps the file
+        self._file = open_memmap(self.path, mode="r+")
+
+    def finalize(self) -> np.ndarray:
+        if self.path is None:
+            return self._file
+        self._file.flush()
+        # reopen read-only: the pages are then shared, clean page cache that any
+        # process reading the embeddings (e.g. forked workers) can map without
+        # making private copies
+        self._file = open_memmap(self.path, mode="r")
+        return self._file
+
+
+class PrefetchLoader:
+    """Wraps a data loader so that the host-to-device copy of the next batch runs on
+    a separate CUDA stream, overlapping with the forward pass on the current batch.
+    On the CPU, batches are yielded unchanged."""
+
+    def __init__(self, loader: Iterable, device: Union[int, str]):
+        self.loader = loader
+        self.device = torch.device(device)
+        self.stream = (
+            torch.cuda.Stream(device=self.device)
+            if self.device.type == "cuda"
+            else None
+        )
+
+    def __len__(self):
+        return len(self.loader)
+
+    def _to_device(self, batch: Dict[str, Any]):
+        if self.stream is None:
+            return batch
+        with torch.cuda.stream(self.stream):
+            return {
+                k: v.to(self.device, non_blocking=True) if torch.is_tensor(v) else v
+                for k, v in batch.items()
+            }
+
+    def __iter__(self):
+        it = iter(self.loader)
+        try:
+            next_batch = self._to_device(next(it))
+        except StopIteration:
+            return
+
+        while True:
+            batch = next_batch
+            if self.stream is not None:
+                current_stream = torch.cuda.current_stream(self.device)
+                current_stream.wait_stream(self.stream)
+                for v in batch.values():
+                    if torch.is_tensor(v):
+                        # prevent the caching allocator from reusing the memory before
+                        # the forward pass on the compute stream is done with it
+                        v.record_stream(current_stream)
+
+            try:
+                next_batch = self._to_device(next(it))
+            except StopIteration:
+                yield batch
+                return
+            yield batch
@@ -59,7 +59,7 @@ class SpotlightSlicer(Slicer):
 
         losses = self._compute_losses(targets=targets, pred_probs=pred_probs, losses=losses)
 
-        embeddings = torch.tensor(embeddings).to(dtype=torch.float, device=self.config.device)
+        embeddings = _to_device(embeddings, device=self.config.device)
 
         all_weights = []
         weights_unnorm = None
@@ -99,22 +99,23 @@ class SpotlightSlicer(Slicer):
             data, embeddings, targets, pred_probs, losses
         )
 
-        losses = self._compute_losses(pred_probs=pred_probs, targets=targets, losses=losses)
-        embeddings = torch.tensor(embeddings).to(dtype=torch.float, device=self.config.device)
-
-
-        all_weights = []
-
-        for slice_idx in range(self.config.n_slices):
-            weights, _, _, _ = md_adversary_weights(
-                mean=self.means[slice_idx],
-                precision=torch.exp(self.precisions[slice_idx]) *
-                torch.eye(self.means[slice_idx].shape[0], device=self.config.device),
-                x=embeddings,
-                losses=losses,
-            )
-            all_weights.append(weights.cpu().numpy())
-        return np.stack(all_weights, axis=1)
+        # the weights do not depend on the losses, but the arguments are still
+        # validated so that predict_proba accepts the same inputs as fit
+        self._check_loss_args(targets=targets, pred_probs=pred_probs, losses=losses)
+        embeddings = _to_device(embeddings, device=self.config.device)
+
+        # the precision matrices are isotropic, so the weights for all slices can be
+        # computed from a single (n_samples, n_slices) matrix of squared distances
+        # rather than one dense (dims, dims) product per slice
+        means = torch.stack(self.means[: self.config.n_slices])
+        precisions = torch.exp(torch.stack(self.precisions[: self.config.n_slices]))
+        dists = torch.cdist(
+            embeddings, means, compute_mode="donot_use_mm_for_euclid_dist"
+        )
+        precisions = precisions.to(dists.dtype)
+        weights_unnorm = torch.exp(-precisions * dists ** 2 / 2)
+        weights = weights_unnorm / weights_unnorm.sum(dim=0)
+        return weights.cpu().numpy()
 
     def predict(
         self,
@@ -136,13 +137,21 @@ class SpotlightSlicer(Slicer):
         weight_thresholds = np.quantile(weights, 1-self.config.spotlight_size, axis=0)
         return (weights > weight_thresholds).astype(np.int32)
     
-    def _compute_losses(
+    def _check_loss_args(
         self, targets: np.ndarray, pred_probs: np.ndarray, losses: np.ndarray
     ):
         error_msg = "Must either provide `losses` or `pred_probs` and `targets`. "
         if losses is None:
             if (targets is None) or (pred_probs is None):
                 raise ValueError(error_msg)
+        elif targets is not None or pred_probs is not None:
+            raise ValueError(error_msg)
+
+    def _compute_losses(
+        self, targets: np.ndarray, pred_probs: np.ndarray, losses: np.ndarray
+    ):
+        self._check_loss_args(targets=targets, pred_probs=pred_probs, losses=losses)
+        if losses is None:
             pred_probs = torch.tensor(pred_probs).to(torch.float32).to(self.config.device)
             targets = torch.tensor(targets).to(torch.long).to(self.config.device)
             losses = cross_entropy(
@@ -151,12 +160,20 @@ class SpotlightSlicer(Slicer):
                 reduction="none",
             )
         else:
-            if targets is not None or pred_probs is not None:
-                raise ValueError(error_msg)
             losses = torch.tensor(losses).to(torch.float32).to(self.config.device)
         return losses 
 
 
+def _to_device(embeddings: np.ndarray, device: torch.device) -> torch.Tensor:
+    embeddings = torch.tensor(embeddings)
+    if embeddings.element_size() < 4:
+        # reduced precision embeddings (e.g. float16 when embedded with
+        # `autocast=True`) are transferred at their reduced size and only upcast
+        # once they are on the device
+        return embeddings.to(device=device).to(dtype=torch.float)
+    return embeddings.to(dtype=torch.float).to(device=device)
+
+
 # Source below copied from spotlight implementation
 # https://github.com/gregdeon/spotlight/blob/main/torch_spotlight/spotlight.py
 
@@ -165,9 +182,14 @@ def gaussian_probs(mean, precision, x):
     # Similarity kernel: describe how similar each point in x is to mean as number in
     # [0, 1]
     # - mean: (dims) vector
-    # - precision: (dims, dims) precision matrix; must be PSD
+    # - precision: (dims, dims) precision matrix; must be PSD. a scalar is treated as
+    # the isotropic precision matrix precision * I, which skips the
+    # (dims, dims) product
     # - x: (num_points, dims) set of points
-    dists = torch.sum(((x - mean) @ precision) * (x - mean), axis=1)
+    if precision.dim() == 0:
+        dists = precision * torch.sum((x - mean) ** 2, axis=1)
+    else:
+        dists = torch.sum(((x - mean) @ precision) * (x - mean), axis=1)
     return torch.exp(-dists / 2)
 
 
@@ -293,11 +315,10 @@ def run_spotlight(
     for t in tqdm(range(n_steps)):  # removed tqdm here
         optimizer.zero_grad()
         precision = torch.exp(log_precision)
-        precision_matrix = torch.eye(x.shape[1], device=device) * precision
 
         objective, total_weight = md_objective(
             mean,
-            precision_matrix,
+            precision,
             x,
             y,
             min_weight,
@@ -321,12 +342,8 @@ def run_spotlight(
 
         if (t + 1) % print_every == 0:
 
-            precision_matrix = torch.eye(
-                dimensions, device=precision.device
-            ) * torch.exp(log_precision)
-
             weights, weights_unnorm, weighted_loss, total_weight = md_adversary_weights(
-                mean, precision_matrix, x, y
+                mean, torch.exp(log_precision), x, y
             )
 
     final_weights = weights.detach()
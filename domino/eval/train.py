@@ -67,22 +67,25 @@ def train(
         }
     )
 
+    # keep each loader's workers alive between epochs, rather than re-spawning them
+    # every time lightning switches between training and validation
+    loader_kwargs = dict(
+        batch_size=batch_size,
+        num_workers=num_workers,
+        pin_memory=torch.cuda.is_available(),
+        persistent_workers=num_workers > 0,
+    )
+
     train_dp = dp.lz[dp["split"] == train_split]
     if model.config.get("train_transform", None) is not None:
         train_dp["input"] = train_dp["input"].to_lambda(model.config["train_transform"])
 
-    train_dl = DataLoader(
-        train_dp,
-        batch_size=batch_size,
-        num_workers=num_workers,
-    )
+    train_dl = DataLoader(train_dp, **loader_kwargs)
 
     valid_dp = dp.lz[dp["split"] == valid_split]
     if model.config.get("transform", None) is not None:
         valid_dp["input"] = valid_dp["input"].to_lambda(model.config["transform"])
-    valid_dl = DataLoader(
-        valid_dp, batch_size=batch_size, num_workers=num_workers, shuffle=True
-    )
+    valid_dl = DataLoader(valid_dp, shuffle=True, **loader_kwargs)
 
     trainer.fit(model, train_dl, valid_dl)
     return model
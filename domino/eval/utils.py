@@ -4,6 +4,8 @@ import meerkat as mk
 import numpy as np
 import pandas as pd
 
+from domino.utils import convert_to_numpy, unpack_args
+
 
 class CorrelationImpossibleError(ValueError):
     def __init__(
@@ -33,17 +35,25 @@ def induce_correlation(
     mu_b: float = None,
     match_mu: bool = False,
     replace: bool = False,
+    random_state: Union[int, np.random.Generator] = None,
 ):
     """
     Induce a correlation `corr` between two boolean columns `attr_a` and `attr_b` by
     subsampling `df`, while maintaining mean and variance. If `match_mu` is `True` then
-    take the minimum mean among the two attributes and use it for both.
+    take the minimum mean among the two attributes and use it for both. Pass
+    `random_state` to make the subsample reproducible, if it is `None` the sample is
+    drawn from numpy's global random state (see `np.random.seed`).
     """
+    # pull the attributes out as boolean arrays once, so that the masks below are
+    # plain vectorized numpy ops rather than repeated column lookups
+    a, b = convert_to_numpy(*unpack_args(dp, attr_a, attr_b))
+    a, b = np.asarray(a) == 1, np.asarray(b) == 1
+
     if mu_a is None:
-        mu_a = dp[attr_a].mean()
+        mu_a = a.mean()
 
     if mu_b is None:
-        mu_b = dp[attr_b].mean()
+        mu_b = b.mean()
 
     if match_mu:
         mu = min(mu_a, mu_b)
@@ -60,22 +70,24 @@ def induce_correlation(
     n_a1_b0 = n_a1 - n_1
     n_a0_b1 = n_b1 - n_1
 
-    both_1 = (dp[attr_a] == 1) & (dp[attr_b] == 1)
-    both_0 = (dp[attr_a] == 0) & (dp[attr_b] == 0)
+    both_1 = a & b
+    both_0 = ~a & ~b
+    only_a = a & ~b
+    only_b = ~a & b
 
     # check if requested correlation is possible
     msg = None
-    if int(n_a1) > dp[attr_a].sum():
+    if int(n_a1) > a.sum():
         msg = "Not enough samples where a=1. Try a lower mu_a."
-    elif int(n_b1) > dp[attr_b].sum():
+    elif int(n_b1) > b.sum():
         msg = "Not enough samples where b=1. Try a lower mu_b."
     elif int(n_1) > both_1.sum():
         msg = "Not enough samples where a=1 and b=1. Try a lower corr or smaller n."
     elif int(n_0) > both_0.sum():
         msg = "Not enough samples where a=0 and b=0. Try a lower corr or smaller n."
-    elif int(n_a1_b0) > (dp[attr_a] & (1 - both_1)).sum():
+    elif int(n_a1_b0) > only_a.sum():
         msg = "Not enough samples where a=1 and b=0. Try a higher corr or smaller n."
-    elif int(n_a0_b1) > (dp[attr_b] & (1 - both_1)).sum():
+    elif int(n_a0_b1) > only_b.sum():
         msg = "Not enough samples where a=0 and b=1. Try a higher corr or smaller n."
     elif n_1 < 0:
         msg = "Insufficient variance for desired corr. Try mu_a or mu_b closer to 0.5 "
@@ -86,26 +98,21 @@ def induce_correlation(
     if msg is not None:
         raise CorrelationImpossibleError(corr, n, attr_a, attr_b, mu_a, mu_b, msg)
 
-    indices = []
-    indices.extend(
-        np.random.choice(np.where(both_1)[0], size=int(n_1), replace=replace)
-    )
-    indices.extend(
-        np.random.choice(
-            np.where(dp[attr_a] & (1 - both_1))[0], size=int(n_a1_b0), replace=replace
-        )
-    )
-    indices.extend(
-        np.random.choice(
-            np.where(dp[attr_b] & (1 - both_1))[0], size=int(n_a0_b1), replace=replace
-        )
-    )
-    indices.extend(
-        np.random.choice(
-            np.where(both_0)[0],
-            size=int(n_0),
-            replace=replace,
-        )
+    if random_state is None:
+        # draw the seed from the legacy global state, so that callers seeding with
+        # `np.random.seed` still get reproducible subsamples
+        random_state = np.random.randint(np.iinfo(np.int32).max)
+    rng = np.random.default_rng(random_state)
+    indices = np.concatenate(
+        [
+            rng.choice(np.flatnonzero(mask), size=int(size), replace=replace)
+            for mask, size in [
+                (both_1, n_1),
+                (only_a, n_a1_b0),
+                (only_b, n_a0_b1),
+                (both_0, n_0),
+            ]
+        ]
     )
-    np.random.shuffle(indices)
+    rng.shuffle(indices)
     return indices
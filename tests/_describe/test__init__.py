@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from domino import describe
+
+
+@pytest.fixture()
+def describe_kwargs():
+    rng = np.random.default_rng(0)
+    return dict(
+        embeddings=rng.normal(size=(64, 8)).astype(np.float32),
+        targets=rng.integers(0, 2, size=64),
+        slices=rng.random(size=(64, 3)),
+        text_embeddings=rng.normal(size=(10, 8)).astype(np.float32),
+        phrases=np.array([f"phrase {idx}" for idx in range(10)]),
+    )
+
+
+def test_describe(describe_kwargs):
+    dp = describe(**describe_kwargs, slice_idx=1)
+
+    assert dp["score"].shape == (10,)
+    assert (dp["phrase"] == describe_kwargs["phrases"]).all()
+
+
+@pytest.mark.parametrize("slice_idx", [[0, 1, 2], np.array([2, 0])])
+def test_describe_multiple_slices(describe_kwargs, slice_idx):
+    dp = describe(**describe_kwargs, slice_idx=slice_idx)
+
+    assert dp["score"].shape == (10, len(slice_idx))
+    for col, idx in enumerate(slice_idx):
+        expected = describe(**describe_kwargs, slice_idx=int(idx))["score"]
+        np.testing.assert_allclose(dp["score"][:, col], expected, rtol=1e-5)
@@ -85,6 +85,45 @@ def test_embed_text(simple_encoder):
     )
 
 
+def test_embed_images_multiple_encoders(tmpdir: str, simple_encoder):
+    image_testbed = ImageColumnTestBed(tmpdir=tmpdir)
+
+    dp = mk.DataPanel({"image": image_testbed.col})
+    dp = embed(
+        data=dp,
+        input_col="image",
+        encoder=["_simple_encoder", "_simple_encoder"],
+        out_col=["emb_a", "emb_b"],
+        batch_size=4,
+        num_workers=0,
+        mmap_dir=str(tmpdir),
+    )
+
+    assert isinstance(dp, mk.DataPanel)
+    assert "emb_a" in dp and "emb_b" in dp
+    assert (dp["emb_a"].data == dp["emb_b"].data).all()
+    assert not dp["emb_a"].data.flags.writeable
+    assert (
+        simple_image_transform(dp["image"][0]).mean() == dp["emb_a"][0].mean()
+    )
+
+
+def test_embed_autocast(tmpdir: str, simple_encoder):
+    image_testbed = ImageColumnTestBed(tmpdir=tmpdir)
+
+    dp = mk.DataPanel({"image": image_testbed.col})
+    dp = embed(
+        data=dp,
+        input_col="image",
+        encoder="_simple_encoder",
+        batch_size=4,
+        num_workers=0,
+        autocast=True,
+    )
+
+    assert dp["_simple_encoder(image)"].data.dtype == np.float16
+
+
 def test_encoders_repr():
     assert isinstance(domino.encoders, Registry)
     assert isinstance(domino.encoders.__repr__(), str)
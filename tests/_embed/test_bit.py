@@ -0,0 +1,24 @@
+import importlib
+
+import pytest
+import torch
+
+pytest.importorskip("torchvision")
+
+# the `domino._embed.bit` attribute is the encoder function, not the module
+bit_module = importlib.import_module("domino._embed.bit")
+
+
+@pytest.mark.parametrize("compile_model", [False, True])
+def test_bit_skips_head(monkeypatch, compile_model: bool):
+    model = bit_module.ResNetV2([1, 1, 1, 1], width_factor=1, head_size=10)
+    monkeypatch.setattr(bit_module, "_get_model", lambda variant: model)
+
+    head_calls = []
+    model.head.register_forward_hook(lambda *args: head_calls.append(args))
+
+    encoder = bit_module.bit(compile_model=compile_model)["image"]
+    emb = encoder.encode(torch.ones(2, 3, 32, 32))
+
+    assert emb.shape == (2, 2048)
+    assert len(head_calls) == 0
@@ -0,0 +1,57 @@
+import pytest
+import torch
+
+from domino._embed.utils import (
+    ActivationExtractor,
+    StopForward,
+    _get_reduction_fn,
+    maybe_compile,
+)
+
+
+@pytest.mark.parametrize("reduction", ["mean", "max"])
+def test_get_reduction_fn(reduction: str):
+    activation = torch.arange(2 * 3 * 4 * 4, dtype=torch.float32).view(2, 3, 4, 4)
+
+    reduction_fn = _get_reduction_fn(reduction)
+
+    expected = getattr(activation.flatten(start_dim=-2), reduction)(dim=-1)
+    if reduction == "max":
+        expected = expected.values
+    assert reduction_fn.__name__ == reduction
+    assert torch.equal(reduction_fn(activation), expected)
+
+
+def test_get_reduction_fn_unsupported():
+    with pytest.raises(ValueError):
+        _get_reduction_fn("median")
+
+
+def test_activation_extractor_stop_forward():
+    model = torch.nn.Sequential(torch.nn.Conv2d(3, 4, 1), torch.nn.Conv2d(4, 5, 1))
+    extractor = ActivationExtractor(
+        reduction_fn=_get_reduction_fn("mean"), stop_forward=True
+    )
+    model[0].register_forward_hook(extractor.add_hook)
+
+    later_calls = []
+    model[1].register_forward_hook(lambda *args: later_calls.append(args))
+
+    with pytest.raises(StopForward):
+        model(torch.ones(2, 3, 4, 4))
+
+    assert extractor.activation.shape == (2, 4)
+    assert len(later_calls) == 0
+
+
+def test_maybe_compile_disabled():
+    model = torch.nn.Linear(3, 4)
+    assert maybe_compile(model) is model
+    assert maybe_compile(model, compile_model=False) is model
+
+
+def test_maybe_compile_unsupported(monkeypatch):
+    monkeypatch.delattr(torch, "compile")
+    model = torch.nn.Linear(3, 4)
+    with pytest.warns(UserWarning):
+        assert maybe_compile(model, compile_model=True) is model
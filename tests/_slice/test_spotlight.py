@@ -1,8 +1,10 @@
 from sklearn import metrics
 import pytest 
 import numpy as np
+import torch
 
 from domino import SpotlightSlicer
+from domino._slice.spotlight import md_adversary_weights
 
 
 from ..testbeds import SliceTestBed
@@ -40,3 +42,38 @@ def test_domino_results(pass_losses):
     # assert that the shape of the array is (n_samples, n_slices)
     assert prob_slices.shape == (len(testbed.dp), 2)
 
+
+def test_predict_proba_matches_md_adversary_weights():
+    testbed = SliceTestBed(length=9)
+
+    method = SpotlightSlicer(n_slices=2, n_steps=3)
+    method.fit(data=testbed.dp, losses="losses")
+    prob_slices = method.predict_proba(data=testbed.dp, losses="losses")
+    assert prob_slices.dtype == np.float32
+
+    x = torch.tensor(np.asarray(testbed.dp["embedding"]), dtype=torch.float)
+    losses = torch.tensor(np.asarray(testbed.dp["losses"]), dtype=torch.float)
+    for slice_idx in range(2):
+        precision = torch.exp(method.precisions[slice_idx]).to(torch.float)
+        weights, _, _, _ = md_adversary_weights(
+            mean=method.means[slice_idx],
+            precision=precision * torch.eye(x.shape[1]),
+            x=x,
+            losses=losses,
+        )
+        assert np.allclose(prob_slices[:, slice_idx], weights.numpy(), rtol=1e-4)
+
+
+@pytest.mark.parametrize("dtype", [np.float16, np.float64])
+def test_embedding_dtypes(dtype):
+    testbed = SliceTestBed(length=9)
+    embeddings = np.asarray(testbed.dp["embedding"]).astype(dtype)
+
+    method = SpotlightSlicer(n_slices=2, n_steps=3)
+    method.fit(embeddings=embeddings, losses="losses", data=testbed.dp)
+
+    prob_slices = method.predict_proba(
+        embeddings=embeddings, losses="losses", data=testbed.dp
+    )
+    assert prob_slices.dtype == np.float32
+    assert prob_slices.shape == (len(testbed.dp), 2)
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from domino.eval.utils import induce_correlation
+
+
+@pytest.fixture()
+def df():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {"a": rng.integers(0, 2, size=2000), "b": rng.integers(0, 2, size=2000)}
+    )
+
+
+def _sample(df: pd.DataFrame, **kwargs):
+    return induce_correlation(
+        df, corr=0.5, n=400, attr_a="a", attr_b="b", match_mu=True, **kwargs
+    )
+
+
+def test_induce_correlation_random_state(df):
+    assert (_sample(df, random_state=42) == _sample(df, random_state=42)).all()
+    assert not (_sample(df, random_state=42) == _sample(df, random_state=43)).all()
+
+
+def test_induce_correlation_global_seed(df):
+    np.random.seed(42)
+    first = _sample(df)
+    np.random.seed(42)
+    second = _sample(df)
+    assert (first == second).all()
+
+
+def test_induce_correlation_indices(df):
+    indices = _sample(df, random_state=42)
+
+    assert isinstance(indices, np.ndarray)
+    assert np.issubdtype(indices.dtype, np.integer)
+    assert len(indices) == len(np.unique(indices))
+
+    sample = df.iloc[indices]
+    assert sample["a"].mean() == pytest.approx(sample["b"].mean())
+    assert np.corrcoef(sample["a"], sample["b"])[0, 1] == pytest.approx(0.5, abs=0.01)